@@ -0,0 +1,161 @@
+"""
+Memory benchmark for large batches.
+
+Runs a synthetic backlog through description.iter_fact_checks with the
+network stages (search, article extraction, LLM) replaced by in-process
+fakes that return full-size payloads: 5 trusted hits per claim and 5000
+characters of text per article. Extracted articles go into a real
+in-memory evidence index (EVIDENCE_MAX_PASSAGES). RSS is sampled every
+10% of the backlog: it climbs until the index is full, then, with results
+streamed out instead of accumulated, it should stay flat.
+
+Usage:
+    python benchmarks/bench_memory.py [--claims 10000] [--concurrency 8]
+                                      [--max-growth 0.2] [--accumulate] [--null-index]
+
+--accumulate keeps every result in a list (the old /fact-check/all
+behaviour) for comparison; --null-index leaves the evidence index out.
+Exits non-zero if RSS grows by more than --max-growth between the first
+checkpoint with a full index and the last one.
+"""
+import argparse
+import asyncio
+import contextlib
+import os
+import resource
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import description
+from config import Config
+from evidence_index import EvidenceIndex
+from models import SearchHit
+from resources import resources
+
+ARTICLE_TEXT = ("Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 100)[:5000]
+LLM_RESPONSE = (
+    '{"verdict": "TRUE", "confidence": 0.9, "summary": "Sources agree.", '
+    '"reasoning": "All sources support the claim.", "key_quotes": ""}'
+)
+
+
+def fake_search_text(query, timeout=10):
+    return [
+        SearchHit(title=f"{query[:30]} #{i}", link=f"https://www.nih.gov/{i}/{hash(query)}", snippet=query[:100])
+        for i in range(5)
+    ]
+
+
+def fake_extract_article_text(url, max_retries=2, timeout=5):
+    # Fresh string per call, like a real download
+    return url + " " + ARTICLE_TEXT
+
+
+class NullEvidenceIndex:
+    """Keeps the local evidence index out of the measurement."""
+
+    def search(self, query, k=5, min_score=0.0):
+        return []
+
+    def add_article(self, title, url, trust, text, added_at=None, source_hash=""):
+        return 0
+
+    def __len__(self):
+        return 0
+
+    def save(self):
+        pass
+
+
+async def fake_llama(prompt, timeout=None):
+    await asyncio.sleep(0)
+    return LLM_RESPONSE
+
+
+def current_rss_mb():
+    """Current resident set size, falling back to peak RSS off Linux."""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError):
+        return peak_rss_mb()
+
+
+def peak_rss_mb():
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS reports bytes
+    return maxrss / 1024 if sys.platform != "darwin" else maxrss / (1024 * 1024)
+
+
+def index_full(passages):
+    return passages >= int(Config.EVIDENCE_MAX_PASSAGES * EvidenceIndex.TRIM_TO)
+
+
+async def run(n_claims, concurrency, accumulate):
+    claims = (f"Claim number {i}: drinking water every day improves health" for i in range(n_claims))
+    checkpoint = max(1, n_claims // 10)
+    samples = []
+    kept = []
+
+    done = 0
+    async for _, result in description.iter_fact_checks(claims, concurrency=concurrency):
+        done += 1
+        if accumulate:
+            kept.append(result)
+        if done % checkpoint == 0:
+            samples.append((done, current_rss_mb(), len(resources.evidence_index)))
+
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure RSS over a large fact-check batch")
+    parser.add_argument("--claims", type=int, default=10000)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--max-growth", type=float, default=0.2, help="Allowed RSS growth (fraction)")
+    parser.add_argument("--accumulate", action="store_true", help="Keep all results in memory")
+    parser.add_argument("--null-index", action="store_true", help="Leave the evidence index out")
+    args = parser.parse_args()
+
+    description.search_text = fake_search_text
+    description.extract_article_text = fake_extract_article_text
+    description.llama = fake_llama
+    if args.null_index:
+        resources._evidence_index = NullEvidenceIndex()
+    else:
+        resources._evidence_index = EvidenceIndex(path=None, max_passages=Config.EVIDENCE_MAX_PASSAGES)
+
+    start = time.perf_counter()
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        samples = asyncio.run(run(args.claims, args.concurrency, args.accumulate))
+    elapsed = time.perf_counter() - start
+
+    print(f"{'='*70}")
+    print(f"{args.claims} claims, concurrency {args.concurrency}"
+          f"{' (accumulating results)' if args.accumulate else ''}")
+    print(f"{'='*70}")
+    for done, rss, passages in samples:
+        print(f"  {done:>8} claims   RSS {rss:8.1f} MB   index {passages:>6} passages")
+    print(f"  Peak RSS: {peak_rss_mb():.1f} MB")
+    print(f"  Throughput: {args.claims / elapsed:.0f} claims/s")
+
+    # The index is bounded, not flat: compare from the first checkpoint where it is full
+    steady = [s for s in samples if index_full(s[2])]
+    if args.null_index or not steady:
+        steady = samples
+    if len(steady) < 2:
+        return
+    first, last = steady[0][1], steady[-1][1]
+    growth = (last - first) / first
+    print(f"  RSS growth after checkpoint at {steady[0][0]} claims: {growth * 100:.1f}%")
+    if growth > args.max_growth:
+        print(f"  ❌ RSS grew more than {args.max_growth * 100:.0f}%")
+        sys.exit(1)
+    print(f"  ✅ RSS stayed flat")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+Claim cleaning micro-benchmark.
+
+Compares the original per-string clean_claim (copied below as
+legacy_clean_claim) with claim_cleaner.normalize_claims on a synthetic
+backlog of noisy claims (YouTube titles, social posts, plain text).
+Before timing, checks normalize_claims against REGRESSION_CASES and
+exits non-zero if any query comes out wrong.
+
+Usage:
+    python benchmarks/bench_normalize.py [--claims 10000] [--batch 1000] [--repeat 5]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from claim_cleaner import normalize_claims
+
+
+def legacy_clean_claim(claim: str) -> str:
+    """description.clean_claim before batch normalization."""
+    if "YouTube" in claim or "youtube.com" in claim:
+        segments = [s.strip() for s in claim.split('·') if s.strip() and len(s.strip()) > 20]
+        if segments:
+            for seg in segments:
+                if not any(char.isdigit() for char in seg[:5]):
+                    return seg
+            return segments[-1]
+    return claim[:200].strip()
+
+
+SUBJECTS = ["Drinking coffee", "The MMR vaccine", "5G towers", "Eating carrots", "The moon landing", "Vitamin C"]
+PREDICATES = ["causes cancer", "cures the common cold", "was faked", "improves night vision", "spreads viruses"]
+TEMPLATES = [
+    "{s} {p} · Health Channel · {n}K views · {d} days ago - YouTube https://www.youtube.com/watch?v=abc{n}",
+    "🚨 BREAKING: {s} {p}!!! #truth #wakeup @newsdesk https://t.co/x{n} {d}:3{d} PM",
+    "{s} {p} according to a new study published on March {d}, 2024",
+    "“{s}” {p} — experts say… {n} likes {d} comments",
+    "{s} {p}",
+]
+
+
+# (raw claim, expected query): metadata is stripped, claim content is not
+REGRESSION_CASES = [
+    ("The Berlin Wall fell on November 9, 1989 in Germany",
+     "The Berlin Wall fell on November 9, 1989 in Germany"),
+    ("On 2020-03-11 the WHO declared a pandemic", "On 2020-03-11 the WHO declared a pandemic"),
+    ("YouTube removed 1 million videos about vaccines", "YouTube removed 1 million videos about vaccines"),
+    ("3 shares traded 5 years ago", "3 shares traded 5 years ago"),
+    ("John 3:16 is the most quoted verse", "John 3:16 is the most quoted verse"),
+    ("Shows on netflix.com/browse are censored", "Shows on netflix.com/browse are censored"),
+    ("The moon landing was faked · Truth TV · 12K views · 3 days ago - YouTube https://www.youtube.com/watch?v=abc1",
+     "The moon landing was faked"),
+    ("Apollo 11 landed on July 20, 1969 | History Channel | 5 days ago",
+     "Apollo 11 landed on July 20, 1969"),
+    ("5G towers spread viruses #truth @newsdesk https://t.co/x1 3:30 PM", "5G towers spread viruses @newsdesk"),
+    ("@WHO says masks cut transmission by 50%", "@WHO says masks cut transmission by 50%"),
+]
+
+
+def check_regressions():
+    normalized = normalize_claims(raw for raw, _ in REGRESSION_CASES)
+    failures = [
+        (raw, expected, n.query)
+        for (raw, expected), n in zip(REGRESSION_CASES, normalized)
+        if n.query != expected
+    ]
+    for raw, expected, query in failures:
+        print(f"❌ {raw!r}\n     expected {expected!r}\n     got      {query!r}")
+    return not failures
+
+
+def make_claims(n, seed=0):
+    rng = random.Random(seed)
+    return [
+        rng.choice(TEMPLATES).format(
+            s=rng.choice(SUBJECTS), p=rng.choice(PREDICATES),
+            n=rng.randint(1, 999), d=rng.randint(1, 9),
+        )
+        for _ in range(n)
+    ]
+
+
+def best_of(repeat, fn):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark claim cleaning")
+    parser.add_argument("--claims", type=int, default=10000)
+    parser.add_argument("--batch", type=int, default=1000, help="Claims per normalize_claims call")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    if not check_regressions():
+        sys.exit(1)
+
+    claims = make_claims(args.claims)
+    batches = [claims[i:i + args.batch] for i in range(0, len(claims), args.batch)]
+
+    legacy = best_of(args.repeat, lambda: [legacy_clean_claim(c) for c in claims])
+    one_by_one = best_of(args.repeat, lambda: [normalize_claims([c]) for c in claims])
+    batched = best_of(args.repeat, lambda: [normalize_claims(b) for b in batches])
+
+    print(f"{'='*70}")
+    print(f"{args.claims} claims, best of {args.repeat}")
+    print(f"{'='*70}")
+    for name, elapsed in [
+        ("legacy clean_claim", legacy),
+        ("normalize_claims, 1 per call", one_by_one),
+        (f"normalize_claims, {args.batch} per call", batched),
+    ]:
+        print(f"  {name:<36} {elapsed * 1000:8.1f} ms   {args.claims / elapsed:10.0f} claims/s")
+
+    normalized = normalize_claims(claims)
+    print(f"\n  Distinct claims: {len(set(claims))}, distinct queries: "
+          f"{len({n.query for n in normalized})}, distinct legacy queries: "
+          f"{len({legacy_clean_claim(c) for c in claims})}")
+
+
+if __name__ == "__main__":
+    main()
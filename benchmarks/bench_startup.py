@@ -0,0 +1,103 @@
+"""
+Cold-start benchmark.
+
+Imports each entry module in a fresh interpreter with `-X importtime`,
+prints the total import time and the slowest modules, and checks that the
+heavy stacks (pymongo, readability/lxml, BeautifulSoup, numpy) are not loaded
+at import time.
+
+Usage:
+    python benchmarks/bench_startup.py [--top 15] [--budget-ms 0]
+
+Exits non-zero if a deferred module got imported eagerly, or if any entry
+module takes longer than --budget-ms (when given).
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ENTRY_MODULES = ["description", "update", "main"]
+
+# Top-level packages that must only be imported on first use
+DEFERRED = ["pymongo", "bson", "readability", "lxml", "bs4", "numpy"]
+
+
+def run_importtime(module: str):
+    """Import module in a fresh interpreter; return (rows, loaded_deferred, error)."""
+    code = (
+        f"import sys; import {module}; "
+        f"print(','.join(m for m in {DEFERRED!r} if m in sys.modules))"
+    )
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT, capture_output=True, text=True,
+    )
+
+    rows = []
+    error = None
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:"):
+            if line.strip():
+                error = line.strip()
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue  # header row
+        self_us, cumulative_us, name = int(parts[0]), int(parts[1]), parts[2][1:].rstrip()
+        rows.append((self_us, cumulative_us, name))
+
+    if proc.returncode != 0:
+        return rows, [], error or f"exit code {proc.returncode}"
+
+    loaded = [m for m in proc.stdout.strip().split(",") if m]
+    return rows, loaded, None
+
+
+def report(module: str, top: int, budget_ms: float) -> bool:
+    rows, loaded, error = run_importtime(module)
+    print(f"\n{'='*70}")
+    print(f"import {module}")
+    print(f"{'='*70}")
+
+    if error:
+        print(f"  ❌ Import failed: {error}")
+        return False
+
+    top_level = [r for r in rows if not r[2].startswith(" ")]
+    total_ms = sum(r[1] for r in top_level) / 1000
+    print(f"  Total import time: {total_ms:.1f} ms ({len(rows)} modules)")
+
+    print(f"  Slowest {top} by cumulative time:")
+    for self_us, cumulative_us, name in sorted(rows, key=lambda r: r[1], reverse=True)[:top]:
+        print(f"    {cumulative_us / 1000:8.1f} ms  (self {self_us / 1000:6.1f} ms)  {name.strip()}")
+
+    ok = True
+    if loaded:
+        print(f"  ❌ Loaded eagerly (should be deferred): {', '.join(loaded)}")
+        ok = False
+    else:
+        print(f"  ✅ No deferred modules loaded at import time")
+
+    if budget_ms and total_ms > budget_ms:
+        print(f"  ❌ Over budget: {total_ms:.1f} ms > {budget_ms:.1f} ms")
+        ok = False
+
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure module import (cold start) time")
+    parser.add_argument("--top", type=int, default=15, help="Number of slowest modules to show")
+    parser.add_argument("--budget-ms", type=float, default=0, help="Fail if an entry module exceeds this")
+    parser.add_argument("modules", nargs="*", default=ENTRY_MODULES)
+    args = parser.parse_args()
+
+    results = [report(m, args.top, args.budget_ms) for m in args.modules]
+    sys.exit(0 if all(results) else 1)
+
+
+if __name__ == "__main__":
+    main()
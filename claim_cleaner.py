@@ -0,0 +1,131 @@
+import re
+import unicodedata
+
+from models import NormalizedClaim
+
+MAX_QUERY_CHARS = 200
+
+# Typographic quotes/dashes/ellipses that NFKC leaves alone
+PUNCT_FOLD = {
+    "\u2018": "'", "\u2019": "'", "\u201a": "'", "\u201b": "'",
+    "\u201c": '"', "\u201d": '"', "\u201e": '"', "\u201f": '"',
+    "\u2013": "-", "\u2014": "-", "\u2015": "-", "\u2212": "-",
+    "\u2026": "...",
+}
+PUNCT_FOLD_RE = re.compile("[" + "".join(PUNCT_FOLD) + "]")
+
+MONTHS = r"(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\.?"
+UNITS = r"(?:seconds?|minutes?|mins?|hours?|hrs?|days?|weeks?|months?|years?)"
+COUNTERS = r"(?:[Vv]iews?|[Ll]ikes?|[Cc]omments?|[Ss]ubscribers?|[Ss]hares?|[Rr]etweets?|[Rr]eposts?|[Ff]ollowers?|[Rr]eplies)"
+
+# Noise is matched case-sensitively, and every branch starts with a literal
+# or a character class; everything that starts with a digit shares one
+# branch. Leading \b, lookbehinds and re.IGNORECASE make the regex engine try
+# every branch at every position, which is several times slower.
+
+# Stripped from every claim
+NOISE_PATTERNS = [
+    # URLs, with or without a scheme for the usual social hosts. The
+    # lookbehind keeps x.com from matching inside netflix.com; it is the one
+    # branch that pays for it
+    r"https?://\S+|www\.\S+",
+    r"(?<![\w.])(?:[\w-]+\.)*(?:youtu\.be|youtube\.com|t\.co|bit\.ly|tiktok\.com|instagram\.com|x\.com|twitter\.com|facebook\.com|fb\.watch)/\S*",
+    # Hashtags; @mentions are kept, they often name who made the claim
+    r"#\w+",
+    # Pictographs, flags, dingbats, variation selectors, ZWJ and keycaps
+    "[\U0001F000-\U0001FAFF\u2600-\u27bf\u2b00-\u2bff\ufe0e\ufe0f\u200d\u20e3]+",
+    # Page title suffix: "Title - YouTube https://..."
+    r"[-|\u00b7]\s*YouTube(?:\s+https?://\S+)*\s*\Z",
+    r"(?:Watch|WATCH|Duration|Uploaded by|Posted by|Streamed live(?: on)?)\s?:",
+]
+NOISE_RE = re.compile("|".join(NOISE_PATTERNS))
+
+# Stripped only from the metadata of claims that carry page metadata (see
+# METADATA_HINT_RE); in a plain claim, dates and counts are content
+METADATA_PATTERNS = [
+    # Dates, times, relative timestamps, view/like counters
+    r"\d(?:"
+    + "|".join([
+        r"\d{3}-\d{2}-\d{2}(?:[T ]\d{2}:\d{2}(?::\d{2})?(?:\.\d+)?(?:Z|[+-]\d{2}:?\d{2})?)?\b",
+        r"\d?/\d{1,2}/\d{2,4}\b",
+        r"\d?:\d{2}(?::\d{2})?(?:\s?[AaPp][Mm])?\b",
+        rf"\d?\s+{MONTHS}\s+\d{{4}}\b",
+        rf"\d*\s+{UNITS}\s+ago\b",
+        rf"[\d.,]*\s?[KkMmBb]?\s+{COUNTERS}\b",
+    ])
+    + ")",
+    rf"{MONTHS}\s+\d{{1,2}}(?:st|nd|rd|th)?,?\s+\d{{4}}\b",
+    rf"[Aa]n?\s+{UNITS}\s+ago\b",
+    r"Subscribe\b",
+]
+METADATA_RE = re.compile("|".join(METADATA_PATTERNS))
+
+# Claims copied from a page title or post: segment separators or links
+METADATA_HINT_RE = re.compile(r"https?://|www\.|youtube\.com/|youtu\.be/|\u00b7| \| ")
+
+# Separator runs left behind once metadata is gone: "· ·", "| |"
+DANGLING_RE = re.compile(r"[\u00b7|\u2022](?:\s*[\u00b7|\u2022])+")
+# Only runs that actually need collapsing (not every single space)
+SPACE_RE = re.compile(r" \s+|[^\S ]\s*")
+SEGMENT_RE = re.compile(r"\u00b7| \| ")
+
+
+def _pick_segment(segments, stripped) -> str:
+    """
+    YouTube/social titles come as 'Title · Channel · 1.2M views'; keep the
+    title: the first long segment that is mostly not metadata and doesn't
+    start with a number. It is returned unstripped, so dates and numbers
+    that are part of the title survive.
+    """
+    segments = [seg.strip(" -|") for seg in segments]
+    stripped = [s.strip(" -|") for s in stripped]
+    if len(segments) == 1:
+        return stripped[0]
+    candidates = [
+        (seg, s) for seg, s in zip(segments, stripped)
+        if len(seg) > 20 and len(s) > len(seg) / 2
+    ]
+    if not candidates:
+        return " ".join(stripped)
+    for seg, s in candidates:
+        if not any(char.isdigit() for char in s[:5]):
+            return seg
+    return candidates[-1][1]
+
+
+def _truncate(text: str) -> str:
+    if len(text) <= MAX_QUERY_CHARS:
+        return text
+    cut = text[:MAX_QUERY_CHARS]
+    space = cut.rfind(" ")
+    return (cut[:space] if space > MAX_QUERY_CHARS // 2 else cut).strip()
+
+
+def normalize_claim(claim: str) -> NormalizedClaim:
+    """
+    Clean a raw claim into a search query: strips URLs, emojis, hashtags and
+    page chrome and folds Unicode. Timestamps, counters and similar metadata
+    are only stripped from claims that look like a page title or post
+    (segment separators or links), and from their metadata segments rather
+    than the title itself.
+    """
+    text = claim
+    if not text.isascii():
+        if not unicodedata.is_normalized("NFKC", text):
+            text = unicodedata.normalize("NFKC", text)
+        text = PUNCT_FOLD_RE.sub(lambda m: PUNCT_FOLD[m.group()], text)
+    hinted = METADATA_HINT_RE.search(text) is not None
+    text = NOISE_RE.sub(" ", text)
+    text = DANGLING_RE.sub("\u00b7", text)
+
+    if hinted:
+        segments = SEGMENT_RE.split(text.strip(" \u00b7|-"))
+        text = _pick_segment(segments, [METADATA_RE.sub(" ", seg) for seg in segments])
+
+    query = _truncate(SPACE_RE.sub(" ", text).strip(" \u00b7|-"))
+    return NormalizedClaim(text=claim, query=query or claim[:MAX_QUERY_CHARS].strip())
+
+
+def normalize_claims(claims) -> list:
+    """Clean a batch of raw claims (see normalize_claim)."""
+    return [normalize_claim(claim) for claim in claims]
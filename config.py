@@ -10,4 +10,51 @@ class Config:
     MONGODB_URI = os.getenv('MONGODB_URI')
     MONGODB_DB_NAME = os.getenv('MONGODB_DB_NAME')
     
-    NODE_BACKEND_URL = os.getenv('NODE_BACKEND_URL', 'http://localhost:3000')
\ No newline at end of file
+    NODE_BACKEND_URL = os.getenv('NODE_BACKEND_URL', 'http://localhost:3000')
+
+    # Local evidence index over previously extracted trusted articles
+    EVIDENCE_INDEX_DIR = os.getenv('EVIDENCE_INDEX_DIR', 'evidence_index')
+    EVIDENCE_MAX_PASSAGES = int(os.getenv('EVIDENCE_MAX_PASSAGES', '20000'))
+    EVIDENCE_MAX_AGE_DAYS = int(os.getenv('EVIDENCE_MAX_AGE_DAYS', '30'))
+    # A passage must score at least this (cosine) to count as a local hit,
+    # and this many distinct sources must hit to skip the web search
+    EVIDENCE_MIN_SCORE = float(os.getenv('EVIDENCE_MIN_SCORE', '0.2'))
+    EVIDENCE_MIN_SOURCES = int(os.getenv('EVIDENCE_MIN_SOURCES', '3'))
+
+    # OpenAI-compatible LLM backends as a JSON list, e.g.
+    # [{"url": "http://10.0.0.5:1234/v1/chat/completions", "model": "local-llama", "capacity": 2, "max_concurrency": 4}]
+    # Defaults to a single local server on port 1234. An optional "health_url"
+    # (e.g. http://10.0.0.5:1234/v1/models) is polled to revive the backend early
+    # after it has been marked unhealthy; without one it waits for its cooldown.
+    LLM_BACKENDS = os.getenv('LLM_BACKENDS', '')
+    LLM_TIMEOUT_SECONDS = float(os.getenv('LLM_TIMEOUT_SECONDS', '30'))
+    LLM_FAILURE_THRESHOLD = int(os.getenv('LLM_FAILURE_THRESHOLD', '3'))
+    LLM_COOLDOWN_SECONDS = float(os.getenv('LLM_COOLDOWN_SECONDS', '30'))
+    LLM_HEALTH_CHECK_SECONDS = float(os.getenv('LLM_HEALTH_CHECK_SECONDS', '15'))
+
+    # Per-claim time budget. Search and article extraction stop early enough
+    # to leave LLM_RESERVE_SECONDS (at most half the budget) for the LLM.
+    CLAIM_BUDGET_SECONDS = float(os.getenv('CLAIM_BUDGET_SECONDS', '45'))
+    LLM_RESERVE_SECONDS = float(os.getenv('LLM_RESERVE_SECONDS', '15'))
+    SEARCH_TIMEOUT_SECONDS = float(os.getenv('SEARCH_TIMEOUT_SECONDS', '10'))
+    FETCH_TIMEOUT_SECONDS = float(os.getenv('FETCH_TIMEOUT_SECONDS', '5'))
+    # Send a duplicate request for an article fetch still running after this long
+    HEDGE_AFTER_SECONDS = float(os.getenv('HEDGE_AFTER_SECONDS', '2'))
+    # How many claims a /fact-check/batch request checks at once, and worker
+    # threads for article fetches. By default the pool has room for every
+    # batch claim's fetches (at most 5 search results) plus a hedge for each.
+    BATCH_CONCURRENCY = int(os.getenv('BATCH_CONCURRENCY', '8'))
+    FETCH_WORKERS = int(os.getenv('FETCH_WORKERS', str(BATCH_CONCURRENCY * 5 * 2)))
+    # Stop extracting once this many high-trust articles have arrived
+    EVIDENCE_ENOUGH_HIGH_TRUST = int(os.getenv('EVIDENCE_ENOUGH_HIGH_TRUST', '3'))
+
+    # Re-verification: verdicts stay valid for up to RECHECK_BASE_DAYS
+    # (scaled by confidence, stretched while evidence stays unchanged, capped
+    # at RECHECK_MAX_DAYS); each cycle re-checks at most RECHECK_BATCH_SIZE
+    RECHECK_BASE_DAYS = float(os.getenv('RECHECK_BASE_DAYS', '7'))
+    RECHECK_MAX_DAYS = float(os.getenv('RECHECK_MAX_DAYS', '60'))
+    RECHECK_BATCH_SIZE = int(os.getenv('RECHECK_BATCH_SIZE', '50'))
+    RECHECK_RETRY_HOURS = float(os.getenv('RECHECK_RETRY_HOURS', '6'))
+    # Run a re-check cycle after every background fact-check cycle; otherwise
+    # re-checks only run through /fact-check/recheck or `python reverify.py`
+    RECHECK_IN_BACKGROUND = os.getenv('RECHECK_IN_BACKGROUND', 'false').lower() in ('1', 'true', 'yes')
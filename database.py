@@ -1,20 +1,48 @@
-from config import Config
-import pymongo
+from resources import resources
 
-client = pymongo.MongoClient(Config.MONGODB_URI)   
-db = client[Config.MONGODB_DB_NAME]                
-collection = db['claims']                         
 
 def get_unverified_claims():
 
-    return list(collection.find(
+    return list(resources.claims.find(
         {"verified": False},
         {"resolvedClaim": 1, "_id": 1}
     ))
 
-def mark_verified(claim_id):
-    # Update MongoDB to set verified: true
-    collection.update_one(
+def iter_unverified_claims():
+    # Cursor instead of a list, so large backlogs are fetched in batches
+    return resources.claims.find(
+        {"verified": False},
+        {"resolvedClaim": 1, "_id": 1}
+    )
+
+def mark_verified(claim_id, verification=None):
+    # Update MongoDB to set verified: true, plus the verdict's evidence
+    # fingerprint and re-check schedule (see verification.verification_record)
+    update = {"verified": True}
+    if verification is not None:
+        update["verification"] = verification
+    resources.claims.update_one(
+        {"_id": claim_id},
+        {"$set": update}
+    )
+
+def get_claims_due_for_recheck(now, limit):
+    # Verified claims whose verdict has expired, most overdue first; claims
+    # verified before fingerprints were stored have no schedule and come first
+    return list(resources.claims.find(
+        {
+            "verified": True,
+            "$or": [
+                {"verification.next_check_at": {"$lte": now}},
+                {"verification": {"$exists": False}},
+            ],
+        },
+        {"resolvedClaim": 1, "_id": 1, "verification": 1}
+    ).sort("verification.next_check_at", 1).limit(limit))
+
+def update_verification_schedule(claim_id, **fields):
+    # Update only the given verification.* fields (e.g. checked_at, next_check_at)
+    resources.claims.update_one(
         {"_id": claim_id},
-        {"$set": {"verified": True}}
-    )
\ No newline at end of file
+        {"$set": {f"verification.{key}": value for key, value in fields.items()}}
+    )
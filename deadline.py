@@ -0,0 +1,26 @@
+import time
+
+
+class Deadline:
+    """
+    Time budget for fact-checking one claim.
+
+    Stages ask for remaining() (optionally keeping `reserve` seconds back
+    for later stages) and cap their own timeouts with it. Stages that had
+    to stop early because the budget ran out are recorded in cut_short.
+    """
+
+    def __init__(self, budget: float):
+        self.budget = budget
+        self.expires_at = time.monotonic() + budget
+        self.cut_short = []
+
+    def remaining(self, reserve: float = 0.0) -> float:
+        return max(0.0, self.expires_at - time.monotonic() - reserve)
+
+    def cap(self, timeout: float, reserve: float = 0.0) -> float:
+        return min(timeout, self.remaining(reserve))
+
+    def mark_cut_short(self, stage: str):
+        if stage not in self.cut_short:
+            self.cut_short.append(stage)
@@ -1,23 +1,25 @@
 import json
+import time
 import asyncio
+import functools
+import itertools
 from google_search import search_text
 from extract_article import extract_article_text
 from search_filter import get_domain, HIGH_TRUST, MEDIUM_TRUST
 from llama import llama  # Now async from previous conversion
 from update import mark_verified, send_verified_claim_to_backend
 from database import get_unverified_claims
+from models import Article, Source, FactCheckResult
+from deadline import Deadline
+from verification import evidence_fingerprint, source_hash, verification_record
+from claim_cleaner import normalize_claim, normalize_claims
+from resources import resources
+from config import Config
 
 
 def clean_claim(claim: str) -> str:
     """Clean up claim text by removing YouTube metadata and excessive noise."""
-    if "YouTube" in claim or "youtube.com" in claim:
-        segments = [s.strip() for s in claim.split('·') if s.strip() and len(s.strip()) > 20]
-        if segments:
-            for seg in segments:
-                if not any(char.isdigit() for char in seg[:5]):
-                    return seg
-            return segments[-1]
-    return claim[:200].strip()
+    return normalize_claim(claim).query
 
 
 def get_trust_level(url):
@@ -72,74 +74,9 @@ def parse_json_response(response: str) -> dict:
     }
 
 
-async def fact_check_with_consensus(claim: str) -> dict:
-    """
-    Search for claim, extract articles from trusted sources,
-    and ask LLM to synthesize consensus verdict.
-    """
-    claim_cleaned = clean_claim(claim)
-    
-    print(f"  🔍 Searching for sources...")
-    results = search_text(claim_cleaned)
-    print(f"  Found {len(results)} results")
-    
-    if not results or len(results) == 0:
-        print("  ❌ No search results found")
-        return {
-            "claim": claim,
-            "verdict": "Unverified",
-            "score": 20,
-            "explanation_snippet": "No search results found",
-            "urls": [],
-            "explanation": "No search results found",
-            "sources": []
-        }
-    
-    print(f"  📰 Extracting trusted sources from {len(results)} results...")
-    trusted_articles = []
-    
-    for result in results:
-        try:
-            trust_level = get_trust_level(result["link"])
-            
-            if trust_level in ["high", "medium"]:
-                print(f"    ✅ Extracting {result['title'][:50]}... ({trust_level} trust)")
-                article_text = extract_article_text(result["link"])
-                
-                if article_text and len(article_text) > 100:
-                    trusted_articles.append({
-                        "title": result["title"],
-                        "url": result["link"],
-                        "trust": trust_level,
-                        "text": article_text[:5000]
-                    })
-                    print(f"      ↳ Successfully extracted ({len(article_text)} chars)")
-                else:
-                    print(f"      ↳ Text too short or empty")
-        except Exception as e:
-            print(f"    ⚠️  Could not extract {result.get('link', 'unknown')}: {str(e)[:50]}")
-            continue
-    
-    if not trusted_articles:
-        print("  ❌ No trusted sources found")
-        return {
-            "claim": claim,
-            "verdict": "Unverified",
-            "score": 30,
-            "explanation_snippet": "Search results only from low-trust domains",
-            "urls": [],
-            "explanation": "Search results only from low-trust domains",
-            "sources": []
-        }
-    
-    print(f"  🤖 Extracted {len(trusted_articles)} trusted articles, querying LLM...")
-    
-    article_context = "\n\n---SOURCE BREAK---\n\n".join([
-        f"[{article['trust'].upper()} TRUST] {article['title']}\nURL: {article['url']}\n\n{article['text']}"
-        for article in trusted_articles
-    ])
-    
-    prompt = f"""You are a fact-checker. Analyze these articles from trusted sources and determine if the claim is accurate.
+def build_prompt(claim: str, article_context: str) -> str:
+    """Build the consensus fact-check prompt from the packed article context."""
+    return f"""You are a fact-checker. Analyze these articles from trusted sources and determine if the claim is accurate.
 
 CLAIM TO VERIFY: "{claim}"
 
@@ -165,27 +102,274 @@ Guidelines:
 - confidence: 0.9-1.0 for clear verdicts, 0.7-0.8 for most aligned with nuance, 0.5-0.6 for mixed/conflicting, below 0.5 for insufficient
 - Return ONLY the JSON object, nothing else"""
 
+
+async def find_local_evidence(query: str) -> list:
+    """
+    Look the claim up in the local evidence index of previously extracted
+    trusted articles. Returns [] when too few sources match to skip the search.
+    """
     try:
-        response = await llama(prompt)  # Now properly awaited
+        hits = await asyncio.to_thread(
+            resources.evidence_index.search, query, k=5, min_score=Config.EVIDENCE_MIN_SCORE
+        )
+    except Exception as e:
+        print(f"  ⚠️  Evidence index lookup failed: {str(e)[:50]}")
+        return []
+
+    if len(hits) < Config.EVIDENCE_MIN_SOURCES:
+        return []
+
+    return [
+        Article(
+            title=passages[0].title,
+            url=passages[0].url,
+            trust=passages[0].trust,
+            text=" ".join(p.text for p in passages)[:5000],
+            source_hash=passages[0].source_hash
+        )
+        for _, passages in hits
+    ]
+
+
+def _run_fetch(url: str, deadline: Deadline, reserve: float, started: list, **kwargs) -> str:
+    """One fetch attempt, timed from the budget left when it starts."""
+    started.append(time.monotonic())
+    remaining = deadline.remaining(reserve)
+    timeout = min(Config.FETCH_TIMEOUT_SECONDS, remaining)
+    if timeout <= 0:
+        return ""
+    if remaining < 2 * timeout:
+        # No time for a retry; don't hold the worker past the deadline
+        kwargs["max_retries"] = 1
+    return extract_article_text(url, timeout=timeout, **kwargs)
+
+
+async def fetch_article(url: str, deadline: Deadline, reserve: float) -> str:
+    """Extract an article, hedging with a duplicate request once the first has run for HEDGE_AFTER_SECONDS."""
+    loop = asyncio.get_running_loop()
+    executor = resources.fetch_executor
+    started = []
+    attempts = [loop.run_in_executor(executor, functools.partial(_run_fetch, url, deadline, reserve, started))]
+    try:
+        wait = Config.HEDGE_AFTER_SECONDS
+        while True:
+            done, _ = await asyncio.wait(attempts, timeout=wait)
+            if done:
+                return attempts[0].result()
+            if not started:
+                # Still queued; check again shortly
+                wait = Config.HEDGE_AFTER_SECONDS / 4
+                continue
+            wait = started[0] + Config.HEDGE_AFTER_SECONDS - time.monotonic()
+            if wait <= 0:
+                break
+
+        print(f"    🔁 Slow fetch, hedging {url[:50]}...")
+        attempts.append(loop.run_in_executor(
+            executor, functools.partial(_run_fetch, url, deadline, reserve, [], max_retries=1)
+        ))
+        for attempt in asyncio.as_completed(attempts):
+            try:
+                text = await attempt
+            except Exception:
+                continue
+            if text:
+                return text
+        return ""
+    finally:
+        for attempt in attempts:
+            attempt.cancel()
+
+
+async def search_trusted_articles(query: str, deadline: Deadline, reserve: float, early_stop: bool = True):
+    """
+    Search for the claim and extract trusted articles concurrently within the claim's budget.
+    Returns (links, articles); articles is None if the search found nothing, and links too if it failed.
+    """
+    print(f"  🔍 Searching for sources...")
+    search_timeout = deadline.cap(Config.SEARCH_TIMEOUT_SECONDS, reserve)
+    try:
+        results = await asyncio.wait_for(
+            asyncio.to_thread(search_text, query, timeout=search_timeout),
+            timeout=search_timeout
+        )
+    except asyncio.TimeoutError:
+        print("  ⏱️  Search cut short by the claim's time budget")
+        deadline.mark_cut_short("search")
+        results = []
+    if results is None:
+        print("  ❌ Search failed")
+        return None, None
+    print(f"  Found {len(results)} results")
+    
+    if not results or len(results) == 0:
+        return [], None
+    
+    print(f"  📰 Extracting trusted sources from {len(results)} results...")
+    pending = {}
+    for position, result in enumerate(results):
+        trust_level = get_trust_level(result.link)
+        if trust_level in ["high", "medium"]:
+            print(f"    ✅ Extracting {result.title[:50]}... ({trust_level} trust)")
+            task = asyncio.create_task(fetch_article(result.link, deadline, reserve))
+            pending[task] = (position, result, trust_level)
+    
+    extracted = []
+    try:
+        while pending:
+            remaining = deadline.remaining(reserve)
+            if remaining <= 0:
+                print(f"  ⏱️  Extraction cut short by the claim's time budget ({len(pending)} fetches cancelled)")
+                deadline.mark_cut_short("extraction")
+                break
+            
+            done, _ = await asyncio.wait(pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                position, result, trust_level = pending.pop(task)
+                try:
+                    article_text = task.result()
+                except Exception as e:
+                    print(f"    ⚠️  Could not extract {result.link or 'unknown'}: {str(e)[:50]}")
+                    continue
+                
+                if article_text and len(article_text) > 100:
+                    article_text = article_text[:5000]
+                    extracted.append((position, Article(
+                        title=result.title,
+                        url=result.link,
+                        trust=trust_level,
+                        text=article_text,
+                        source_hash=source_hash(article_text)
+                    )))
+                    print(f"      ↳ Extracted {result.title[:40]} ({len(article_text)} chars)")
+                else:
+                    print(f"      ↳ {result.title[:40]}: text too short or empty")
+            
+            high_trust = sum(1 for _, a in extracted if a.trust == "high")
+            if early_stop and pending and high_trust >= Config.EVIDENCE_ENOUGH_HIGH_TRUST:
+                print(f"  ✋ {high_trust} high-trust articles, skipping {len(pending)} remaining fetches")
+                break
+    finally:
+        for task in pending:
+            task.cancel()
+    
+    # Keep search-result order regardless of which fetch finished first
+    trusted_articles = [article for _, article in sorted(extracted, key=lambda item: item[0])]
+    
+    for article in trusted_articles:
+        try:
+            await asyncio.to_thread(
+                resources.evidence_index.add_article, article.title, article.url, article.trust, article.text,
+                source_hash=article.source_hash
+            )
+        except Exception as e:
+            print(f"    ⚠️  Could not index {article.url}: {str(e)[:50]}")
+            break
+    
+    return [result.link for result in results], trusted_articles
+
+
+async def gather_evidence(query: str, deadline: Deadline, reserve: float, fresh: bool = False):
+    """
+    Collect trusted articles from the local index or, if fresh or too few, a full search.
+    Returns (links, articles); links is None for index evidence or a failed search.
+    """
+    if not fresh:
+        trusted_articles = await find_local_evidence(query)
+        if trusted_articles:
+            print(f"  📚 {len(trusted_articles)} sources found in local evidence index, skipping search")
+            return None, trusted_articles
+    
+    return await search_trusted_articles(query, deadline, reserve, early_stop=not fresh)
+
+
+async def fact_check_with_consensus(claim: str, query: str = None, budget: float = None) -> FactCheckResult:
+    """
+    Find trusted articles for the claim and ask LLM to synthesize consensus verdict,
+    all within `budget` seconds (CLAIM_BUDGET_SECONDS by default).
+    """
+    deadline = Deadline(budget or Config.CLAIM_BUDGET_SECONDS)
+    reserve = min(Config.LLM_RESERVE_SECONDS, deadline.budget / 2)
+    claim_cleaned = query or clean_claim(claim)
+    
+    links, trusted_articles = await gather_evidence(claim_cleaned, deadline, reserve)
+    return await judge_claim(claim, links, trusted_articles, deadline)
+
+
+async def judge_claim(claim: str, links: list, trusted_articles, deadline: Deadline) -> FactCheckResult:
+    """Turn gathered evidence into a verdict, asking the LLM when there are trusted articles."""
+    fingerprint, source_hashes = evidence_fingerprint(links, trusted_articles or [])
+    
+    if trusted_articles is None:
+        if "search" in deadline.cut_short:
+            reason = "Ran out of time searching for sources"
+        elif links is None:
+            reason = "Search failed"
+        else:
+            reason = "No search results found"
+        print(f"  ❌ {reason}")
+        return FactCheckResult(
+            claim=claim,
+            verdict="Unverified",
+            score=20,
+            explanation_snippet=reason,
+            explanation=reason,
+            cut_short=deadline.cut_short,
+            evidence_fingerprint=fingerprint,
+            source_hashes=source_hashes,
+        )
+    
+    if not trusted_articles:
+        if "extraction" in deadline.cut_short:
+            reason = "Ran out of time extracting sources"
+        else:
+            reason = "Search results only from low-trust domains"
+        print(f"  ❌ {reason}")
+        return FactCheckResult(
+            claim=claim,
+            verdict="Unverified",
+            score=30,
+            explanation_snippet=reason,
+            explanation=reason,
+            cut_short=deadline.cut_short,
+            evidence_fingerprint=fingerprint,
+            source_hashes=source_hashes,
+        )
+    
+    print(f"  🤖 Have {len(trusted_articles)} trusted articles, querying LLM...")
+    
+    article_context = "\n\n---SOURCE BREAK---\n\n".join([
+        f"[{article.trust.upper()} TRUST] {article.title}\nURL: {article.url}\n\n{article.text}"
+        for article in trusted_articles
+    ])
+    
+    # Only short snippets are kept on the verdict; drop the full article
+    # bodies now so they aren't held for the duration of the LLM call.
+    urls = [a.url for a in trusted_articles]
+    sources = [Source(title=a.title, link=a.url, snippet=a.text[:150]) for a in trusted_articles]
+    trusted_articles.clear()
+    
+    prompt = build_prompt(claim, article_context)
+    del article_context
+
+    try:
+        llm_timeout = deadline.remaining()
+        response = await llama(prompt, timeout=llm_timeout) if llm_timeout > 1 else ""
         
         if not response or response.strip() == "":
             print("  ❌ LLM did not respond")
-            return {
-                "claim": claim,
-                "verdict": "Unverified",
-                "score": 0,
-                "explanation_snippet": "LLM did not respond",
-                "urls": [a["url"] for a in trusted_articles],
-                "explanation": "Local LLM server returned empty response",
-                "sources": [
-                    {
-                        "title": a["title"],
-                        "link": a["url"],
-                        "snippet": a["text"][:150] if a["text"] else ""
-                    }
-                    for a in trusted_articles
-                ]
-            }
+            if deadline.remaining() < 1:
+                deadline.mark_cut_short("llm")
+            return FactCheckResult(
+                claim=claim,
+                verdict="Unverified",
+                score=0,
+                explanation_snippet="LLM did not respond",
+                explanation="Local LLM server returned empty response",
+                urls=urls,
+                sources=sources,
+                cut_short=deadline.cut_short,
+            )
         
         print("  ✅ LLM responded, parsing JSON...")
         result = parse_json_response(response)
@@ -202,43 +386,84 @@ Guidelines:
     
     mapped_verdict = verdict_map(result.get("verdict", "UNVERIFIABLE"))
     confidence = result.get("confidence", 0)
+    llm_failed = result.get("verdict") in ("ERROR", "PARSE ERROR")
     
-    final_result = {
-        "claim": claim,
-        "verdict": mapped_verdict,
-        "score": int(confidence * 100),
-        "explanation_snippet": result.get("summary", "No summary available"),
-        "urls": [a["url"] for a in trusted_articles],
-        "explanation": result.get("reasoning", "No reasoning available"),
-        "sources": [
-            {
-                "title": a["title"],
-                "link": a["url"],
-                "snippet": a["text"][:150] if a["text"] else ""
-            }
-            for a in trusted_articles
-        ]
-    }
-    
-    return final_result
+    return FactCheckResult(
+        claim=claim,
+        verdict=mapped_verdict,
+        score=int(confidence * 100),
+        explanation_snippet=result.get("summary", "No summary available"),
+        explanation=result.get("reasoning", "No reasoning available"),
+        urls=urls,
+        sources=sources,
+        cut_short=deadline.cut_short,
+        evidence_fingerprint="" if llm_failed else fingerprint,
+        source_hashes=[] if llm_failed else source_hashes,
+    )
+
+
+async def iter_fact_checks(claims, concurrency: int = 1, normalize_batch: int = 256, budgets=None):
+    """
+    Fact-check claims and yield (index, result) as each one completes.
+
+    At most `concurrency` claims are in flight, and claims are pulled from
+    the iterable lazily (normalized `normalize_batch` at a time), so memory
+    stays flat no matter how many there are. Results are not retained after
+    they are yielded. Chunks are pulled in a worker thread, since `claims`
+    may be a database cursor that blocks while it fetches the next batch.
+    budgets optionally gives each claim's time budget by index.
+    """
+    claims = enumerate(claims)
+    queue = []
+    pending = {}
+
+    async def next_claim():
+        if not queue:
+            chunk = await asyncio.to_thread(lambda: list(itertools.islice(claims, normalize_batch)))
+            normalized = normalize_claims(claim for _, claim in chunk)
+            queue.extend(zip((index for index, _ in chunk), normalized))
+            queue.reverse()
+        return queue.pop() if queue else None
+
+    async def schedule():
+        while len(pending) < concurrency:
+            item = await next_claim()
+            if item is None:
+                return
+            index, normalized = item
+            budget = budgets[index] if budgets else None
+            task = asyncio.create_task(fact_check_with_consensus(normalized.text, normalized.query, budget))
+            pending[task] = index
+
+    try:
+        await schedule()
+        while pending:
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                index = pending.pop(task)
+                yield index, task.result()
+            await schedule()
+    finally:
+        for task in pending:
+            task.cancel()
 
 
-def display_result(result):
+def display_result(result: FactCheckResult):
     """Pretty print the result."""
     print(f"\n{'='*70}")
-    print(f"CLAIM: {result['claim']}")
+    print(f"CLAIM: {result.claim}")
     print(f"{'='*70}")
-    print(f"VERDICT: {result['verdict']}")
-    print(f"CONFIDENCE SCORE: {result.get('score', 'N/A')}%")
-    print(f"\nSUMMARY: {result.get('explanation_snippet', 'N/A')}")
-    print(f"\nREASONING:\n{result.get('explanation', 'N/A')}")
+    print(f"VERDICT: {result.verdict}")
+    print(f"CONFIDENCE SCORE: {result.score}%")
+    print(f"\nSUMMARY: {result.explanation_snippet}")
+    print(f"\nREASONING:\n{result.explanation}")
     
-    print(f"\nSOURCES USED: {len(result.get('sources', []))}")
-    for i, source in enumerate(result.get('sources', []), 1):
-        print(f"  {i}. {source['title']}")
-        print(f"     {source['link']}")
-        if source.get('snippet'):
-            print(f"     Snippet: {source['snippet'][:100]}...")
+    print(f"\nSOURCES USED: {len(result.sources)}")
+    for i, source in enumerate(result.sources, 1):
+        print(f"  {i}. {source.title}")
+        print(f"     {source.link}")
+        if source.snippet:
+            print(f"     Snippet: {source.snippet[:100]}...")
     print(f"{'='*70}\n")
 
 
@@ -246,30 +471,31 @@ async def main():
     """Main async entry point."""
     claims = get_unverified_claims()
     print(f"\n📋 Found {len(claims)} unverified claims.\n")
+    normalized = normalize_claims(doc["resolvedClaim"] for doc in claims)
 
-    for doc in claims:
+    for doc, claim in zip(claims, normalized):
         claim_id = doc["_id"]
-        claim_text = doc["resolvedClaim"]
+        claim_text = claim.text
 
         print(f"\n📝 Fact-checking: '{claim_text}'")
 
         # Run fact checker
-        result = await fact_check_with_consensus(claim_text)
+        result = await fact_check_with_consensus(claim_text, claim.query)
         display_result(result)
 
-        # Mark as verified in MongoDB
-        mark_verified(claim_id)
+        # Mark as verified in MongoDB, with the evidence fingerprint for re-checks
+        mark_verified(claim_id, verification_record(result))
         print(f"✅ Marked claim {claim_id} as verified in DB")
 
         try:
             send_verified_claim_to_backend(
-                claim=result["claim"],
-                verdict=result["verdict"],
-                score=result["score"],
-                explanation_snippet=result["explanation_snippet"],
-                urls=result["urls"],
-                explanation=result["explanation"],
-                sources=result["sources"],
+                claim=result.claim,
+                verdict=result.verdict,
+                score=result.score,
+                explanation_snippet=result.explanation_snippet,
+                urls=result.urls,
+                explanation=result.explanation,
+                sources=[s.to_dict() for s in result.sources],
             )
             print("✅ Sent verified claim to Node backend\n")
         except Exception as e:
@@ -277,4 +503,7 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    try:
+        asyncio.run(main())
+    finally:
+        resources.close()
\ No newline at end of file
@@ -0,0 +1,330 @@
+import json
+import os
+import re
+import threading
+import time
+import zlib
+
+import numpy as np
+
+from models import Passage
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+STOPWORDS = frozenset("""
+a an and are as at be been but by for from has have he her his i in is it its
+of on or our she that the their them they this to was we were what when which
+who will with you your not no do does did than then there these those so if
+""".split())
+
+
+def tokenize(text: str):
+    return [t for t in TOKEN_RE.findall(text.lower()) if t not in STOPWORDS and len(t) > 1]
+
+
+def split_passages(text: str, size: int = 1000):
+    """Split article text into passages of roughly `size` characters on word boundaries."""
+    words = text.split()
+    passages, current, length = [], [], 0
+    for word in words:
+        current.append(word)
+        length += len(word) + 1
+        if length >= size:
+            passages.append(" ".join(current))
+            current, length = [], 0
+    if current:
+        passages.append(" ".join(current))
+    return passages
+
+
+def _grow(array, needed: int, limit: int = None):
+    """Return array with room for at least `needed` entries, growing by 25% at a time up to `limit`."""
+    if needed <= len(array):
+        return array
+    capacity = max(needed, len(array) + len(array) // 4, 64)
+    if limit is not None:
+        capacity = max(needed, min(capacity, limit))
+    grown = np.zeros(capacity, dtype=array.dtype)
+    grown[:len(array)] = array
+    return grown
+
+
+class EvidenceIndex:
+    """
+    Local retrieval index over passages of previously extracted trusted articles.
+
+    Passages are vectorized with the hashing trick (unigrams + bigrams,
+    sublinear TF) into L2-normalised rows, stored sparsely (CSR: a column
+    index and a float16 weight per non-zero). IDF weights come from document
+    frequencies kept alongside and are applied to the query only, so adding
+    passages never requires re-vectorizing the corpus. Everything runs on
+    the CPU.
+
+    Replaced passages are zeroed out in place and removed, together with
+    expired and the oldest passages, when the index outgrows max_passages.
+    Passages older than max_age_days are never returned by search().
+
+    All methods take an internal lock, so callers can run them in worker
+    threads. The index is persisted to a directory (vectors.npz +
+    passages.jsonl) and loaded from it on startup.
+    """
+
+    # Compaction shrinks the index to this fraction of max_passages
+    TRIM_TO = 0.9
+    # Non-zeros scored per step in search()
+    BLOCK = 2 ** 20
+
+    def __init__(self, path=None, dims=2 ** 11, max_passages=20000, max_age_days=30):
+        self.path = path
+        self.dims = dims
+        self.max_passages = max_passages
+        self.max_age = max_age_days * 86400
+        # Row i belongs to passages[i]; its non-zeros are _cols/_vals[_indptr[i]:_indptr[i + 1]].
+        # Removed rows hold None, zero weights and an added_at of -inf until
+        # the next compaction.
+        self.passages = []
+        self._indptr = np.zeros(1, dtype=np.int64)
+        self._added_at = np.zeros(0, dtype=np.float64)
+        self._col_dtype = np.int16 if dims <= 2 ** 15 else np.int32
+        self._cols = np.zeros(0, dtype=self._col_dtype)
+        self._vals = np.zeros(0, dtype=np.float16)
+        self.df = np.zeros(dims, dtype=np.int32)
+        self._live = 0
+        self._dirty = False
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+
+        if path and os.path.exists(os.path.join(path, "passages.jsonl")):
+            self.load()
+
+    def __len__(self):
+        return self._live
+
+    @property
+    def _nnz(self):
+        return int(self._indptr[len(self.passages)])
+
+    # --- vectorization ---
+
+    def _vectorize(self, text: str):
+        vec = np.zeros(self.dims, dtype=np.float32)
+        tokens = tokenize(text)
+        grams = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+        for gram in grams:
+            h = zlib.crc32(gram.encode("utf-8"))
+            vec[h % self.dims] += 1.0 if (h >> 31) & 1 else -1.0
+        nonzero = vec != 0
+        vec[nonzero] = np.sign(vec[nonzero]) * (1.0 + np.log(np.abs(vec[nonzero])))
+        return vec
+
+    def _idf(self):
+        return (np.log((1.0 + self._live) / (1.0 + self.df)) + 1.0).astype(np.float32)
+
+    # --- updates ---
+
+    def add_article(self, title: str, url: str, trust: str, text: str, added_at=None, source_hash=""):
+        """Index an article's passages, replacing any earlier copy of the same URL."""
+        added_at = time.time() if added_at is None else added_at
+        chunks = split_passages(text)
+        rows = []
+        for chunk in chunks:
+            vec = self._vectorize(chunk)
+            cols = np.flatnonzero(vec)
+            norm = np.linalg.norm(vec[cols])
+            rows.append((cols.astype(self._col_dtype), (vec[cols] / (norm or 1.0)).astype(np.float16)))
+
+        with self._lock:
+            self._remove_url(url)
+            if not chunks:
+                return 0
+
+            size, nnz = len(self.passages), self._nnz
+            added = sum(len(cols) for cols, _ in rows)
+            self._indptr = _grow(self._indptr, size + len(rows) + 1, self.max_passages + 1)
+            self._added_at = _grow(self._added_at, size + len(rows), self.max_passages)
+            self._cols = _grow(self._cols, nnz + added)
+            self._vals = _grow(self._vals, nnz + added)
+
+            for i, (cols, vals) in enumerate(rows, size):
+                end = self._indptr[i] + len(cols)
+                self._cols[self._indptr[i]:end] = cols
+                self._vals[self._indptr[i]:end] = vals
+                self._indptr[i + 1] = end
+                self.df[cols] += 1
+            self._added_at[size:size + len(rows)] = added_at
+            self.passages.extend(
+                Passage(title=title, url=url, trust=trust, text=chunk, added_at=added_at, source_hash=source_hash)
+                for chunk in chunks
+            )
+            self._live += len(chunks)
+            self._dirty = True
+
+            if len(self.passages) > self.max_passages:
+                self._trim()
+            return len(chunks)
+
+    def remove_url(self, url: str):
+        with self._lock:
+            self._remove_url(url)
+
+    def _remove_url(self, url: str):
+        rows = [i for i, p in enumerate(self.passages) if p is not None and p.url == url]
+        if not rows:
+            return
+        for i in rows:
+            start, end = self._indptr[i], self._indptr[i + 1]
+            self.df[self._cols[start:end]] -= 1
+            self._vals[start:end] = 0
+            self.passages[i] = None
+        self._added_at[rows] = -np.inf
+        self._live -= len(rows)
+        self._dirty = True
+
+    def evict_older_than(self, max_age_seconds=None, now=None):
+        """
+        Drop passages older than max_age_seconds (defaults to the index's max
+        age), compacting away replaced ones too. Returns how many expired.
+        """
+        max_age_seconds = self.max_age if max_age_seconds is None else max_age_seconds
+        cutoff = (time.time() if now is None else now) - max_age_seconds
+        with self._lock:
+            added_at = self._added_at[:len(self.passages)]
+            keep = np.flatnonzero(added_at >= cutoff)
+            if len(keep) == len(self.passages):
+                return 0
+            evicted = self._live - len(keep)
+            self._keep(keep)
+            return evicted
+
+    def _trim(self):
+        # Newest first; replaced rows (-inf) sort last and expired ones are dropped
+        added_at = self._added_at[:len(self.passages)]
+        newest_first = np.argsort(added_at, kind="stable")[::-1]
+        newest_first = newest_first[added_at[newest_first] >= time.time() - self.max_age]
+        self._keep(newest_first[:int(self.max_passages * self.TRIM_TO)])
+
+    def _keep(self, indices):
+        indices = np.sort(np.asarray(indices, dtype=np.int64))
+        size = len(self.passages)
+        lengths = np.diff(self._indptr[:size + 1])
+        keep = np.zeros(size, dtype=bool)
+        keep[indices] = True
+        entries = np.repeat(keep, lengths)
+
+        self._cols = self._cols[:self._nnz][entries]
+        self._vals = self._vals[:len(entries)][entries]
+        self._indptr = np.concatenate([[0], np.cumsum(lengths[indices])]).astype(np.int64)
+        self._added_at = self._added_at[indices]
+        self.passages = [self.passages[i] for i in indices]
+        self.df = np.bincount(self._cols, minlength=self.dims).astype(np.int32)
+        self._live = len(self.passages)
+        self._dirty = True
+
+    # --- search ---
+
+    def search(self, query: str, k: int = 5, min_score: float = 0.0):
+        """
+        Return up to k (score, passages) pairs, one per source URL, best first.
+
+        passages holds every passage of that URL scoring at least min_score,
+        in article order. Passages older than the index's max age are skipped.
+        """
+        q = self._vectorize(query)
+        with self._lock:
+            if not self._live:
+                return []
+
+            q *= self._idf()
+            q_norm = np.linalg.norm(q)
+            if q_norm == 0:
+                return []
+            q /= q_norm
+
+            size, nnz = len(self.passages), self._nnz
+            # One trailing zero so every row start (empty rows included) is a
+            # valid reduceat index; computed in blocks to bound the temporaries
+            products = np.zeros(nnz + 1, dtype=np.float32)
+            for start in range(0, nnz, self.BLOCK):
+                end = min(start + self.BLOCK, nnz)
+                np.multiply(q.take(self._cols[start:end]), self._vals[start:end], out=products[start:end])
+            starts = self._indptr[:size]
+            scores = np.add.reduceat(products, starts)
+            scores[starts == self._indptr[1:size + 1]] = 0.0
+
+            fresh = self._added_at[:size] >= time.time() - self.max_age
+            matches = np.flatnonzero((scores >= min_score) & (scores > 0) & fresh)
+            passages = [(float(scores[i]), self.passages[i]) for i in matches]
+
+        best = {}
+        hits = {}
+        for score, passage in passages:
+            url = passage.url
+            best[url] = max(best.get(url, 0.0), score)
+            hits.setdefault(url, []).append(passage)
+
+        ranked = sorted(best, key=best.get, reverse=True)[:k]
+        return [(best[url], hits[url]) for url in ranked]
+
+    # --- persistence ---
+
+    def save(self):
+        with self._save_lock:
+            # Snapshot under the lock so concurrent adds can't split vectors from passages
+            with self._lock:
+                if not self.path or not self._dirty:
+                    return
+                if self._live != len(self.passages):
+                    self._keep([i for i, p in enumerate(self.passages) if p is not None])
+                size = len(self.passages)
+                vectors = {
+                    "indptr": self._indptr[:size + 1].copy(),
+                    "cols": self._cols[:self._nnz].copy(),
+                    "vals": self._vals[:self._nnz].copy(),
+                }
+                passages = list(self.passages)
+                self._dirty = False
+
+            try:
+                self._write(vectors, passages)
+            except Exception:
+                self._dirty = True
+                raise
+
+    def _write(self, vectors, passages):
+        os.makedirs(self.path, exist_ok=True)
+
+        vectors_tmp = os.path.join(self.path, "vectors.npz.tmp")
+        with open(vectors_tmp, "wb") as f:
+            np.savez(f, **vectors)
+
+        passages_tmp = os.path.join(self.path, "passages.jsonl.tmp")
+        with open(passages_tmp, "w", encoding="utf-8") as f:
+            for p in passages:
+                f.write(json.dumps({
+                    "title": p.title, "url": p.url, "trust": p.trust,
+                    "text": p.text, "added_at": p.added_at, "source_hash": p.source_hash,
+                }) + "\n")
+
+        os.replace(vectors_tmp, os.path.join(self.path, "vectors.npz"))
+        os.replace(passages_tmp, os.path.join(self.path, "passages.jsonl"))
+
+    def load(self):
+        with np.load(os.path.join(self.path, "vectors.npz")) as vectors:
+            indptr, cols, vals = vectors["indptr"], vectors["cols"], vectors["vals"]
+        with open(os.path.join(self.path, "passages.jsonl"), encoding="utf-8") as f:
+            passages = [Passage(**json.loads(line)) for line in f if line.strip()]
+
+        if len(indptr) != len(passages) + 1 or indptr[-1] != len(cols) or len(cols) != len(vals):
+            print(f"⚠️  Evidence index at {self.path} doesn't match its metadata, starting empty")
+            return
+
+        with self._lock:
+            self._indptr = indptr.astype(np.int64)
+            self._cols = cols.astype(self._col_dtype)
+            self._vals = vals.astype(np.float16)
+            self._added_at = np.array([p.added_at for p in passages], dtype=np.float64)
+            self.passages = passages
+            self.df = np.bincount(self._cols, minlength=self.dims).astype(np.int32)
+            self._live = len(passages)
+        self.evict_older_than()
+        self._dirty = False
@@ -1,14 +1,25 @@
 import requests
-from readability import Document
-from bs4 import BeautifulSoup
 
-def extract_article_text(url: str, max_retries=2):
+
+def _html_to_text(html: str) -> str:
+    # readability/lxml and BeautifulSoup are heavy; import them on first use
+    # so endpoints that never extract articles don't pay for them at startup.
+    from readability import Document
+    from bs4 import BeautifulSoup
+
+    summary_html = Document(html).summary()
+    soup = BeautifulSoup(summary_html, "html.parser")
+    return soup.get_text(separator=" ", strip=True)
+
+
+def extract_article_text(url: str, max_retries=2, timeout=5):
     """
     Extract article text from URL with retry logic and proper headers.
     
     Args:
         url: The URL to extract from
         max_retries: Number of retry attempts on failure
+        timeout: Per-request timeout in seconds
     
     Returns:
         Extracted text (up to 5000 chars) or empty string on failure
@@ -25,7 +36,7 @@ def extract_article_text(url: str, max_retries=2):
     
     for attempt in range(max_retries):
         try:
-            response = requests.get(url, timeout=5, headers=headers, allow_redirects=True)
+            response = requests.get(url, timeout=timeout, headers=headers, allow_redirects=True)
             response.raise_for_status()
             
             html = response.text
@@ -35,11 +46,7 @@ def extract_article_text(url: str, max_retries=2):
                 print(f"  📄 Response too small ({len(html)} bytes)")
                 continue
 
-            doc = Document(html)
-            summary_html = doc.summary()
-
-            soup = BeautifulSoup(summary_html, "html.parser")
-            text = soup.get_text(separator=" ", strip=True)
+            text = _html_to_text(html)
             
             if len(text) < 100:
                 print(f"  📄 Extracted text too short ({len(text)} chars)")
@@ -1,7 +1,9 @@
 import requests
 from config import Config
+from models import SearchHit
 
-def search_text(query: str):
+def search_text(query: str, timeout: float = 10):
+    # Returns None if the API call failed, [] if it found nothing
     url = "https://www.googleapis.com/customsearch/v1"
     params = {
         "key": Config.GOOGLE_API_KEY,
@@ -11,10 +13,10 @@ def search_text(query: str):
     }
 
     try:
-        response = requests.get(url, params=params, timeout=10)       
+        response = requests.get(url, params=params, timeout=timeout)       
         if response.status_code != 200:
             print(f"Google Search API error: {response.status_code}")
-            return []
+            return None
         
         data = response.json()       
         if data is None or "items" not in data:
@@ -22,20 +24,20 @@ def search_text(query: str):
         
         results = []
         for item in data["items"]:
-            results.append({
-                "title": item.get("title", ""),
-                "link": item.get("link", ""),
-                "snippet": item.get("snippet", "")
-            })
+            results.append(SearchHit(
+                title=item.get("title", ""),
+                link=item.get("link", ""),
+                snippet=item.get("snippet", "")
+            ))
         
         return results
     
     except requests.exceptions.Timeout:
         print("Google Search API timeout")
-        return []
+        return None
     except requests.exceptions.ConnectionError:
         print("Google Search API connection error")
-        return []
+        return None
     except Exception as e:
         print(f"Error calling Google Search API: {str(e)}")
-        return []
\ No newline at end of file
+        return None
\ No newline at end of file
@@ -1,31 +1,19 @@
 import aiohttp
 import asyncio
 
-async def llama(prompt):
-    url = "http://127.0.0.1:1234/v1/chat/completions"
-    headers = {"Content-Type": "application/json"}
-    
-    data = {
-        "model": "local-llama",
-        "messages": [{"role": "user", "content": prompt}],
-        "temperature": 0.3
-    }
+from resources import resources
+
 
+async def llama(prompt, timeout=None):
+    """
+    Send prompt to the least-loaded healthy LLM backend (see llm_pool.LLMPool).
+    timeout bounds the whole call, including waiting for a free backend and retries.
+    """
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.post(url, json=data, headers=headers, timeout=aiohttp.ClientTimeout(total=30)) as response:
-                response.raise_for_status()
-                
-                result = await response.json()
-                
-                # Correct format for OpenAI-compatible API
-                if "choices" in result and len(result["choices"]) > 0:
-                    return result["choices"][0]["message"]["content"]
-                else:
-                    return ""
+        return await resources.llm_pool.complete(prompt, timeout=timeout)
     
-    except aiohttp.ClientConnectorError:
-        print("❌ Error: Cannot connect to Llama server at http://127.0.0.1:1234")
+    except aiohttp.ClientConnectorError as e:
+        print(f"❌ Error: Cannot connect to Llama server at {e.host}:{e.port}")
         print("   Make sure your local LLM server is running")
         return ""
     except asyncio.TimeoutError:
@@ -45,4 +33,4 @@ async def main():
     print(result)
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    asyncio.run(main())
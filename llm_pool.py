@@ -0,0 +1,249 @@
+import asyncio
+import json
+import time
+
+import aiohttp
+
+from config import Config
+
+DEFAULT_BACKEND = {
+    "url": "http://127.0.0.1:1234/v1/chat/completions",
+    "model": "local-llama",
+}
+
+
+class Backend:
+    """One OpenAI-compatible chat completions server."""
+
+    # A timeout counts as a failure once the request has run this many times
+    # the backend's usual latency (and at least HANG_MIN_SECONDS)
+    HANG_FACTOR = 4.0
+    HANG_MIN_SECONDS = 1.0
+
+    def __init__(self, url, model="local-llama", capacity=1.0, max_concurrency=2, health_url=None):
+        self.url = url
+        self.model = model
+        self.capacity = float(capacity)
+        self.max_concurrency = int(max_concurrency)
+        self.health_url = health_url
+
+        self.in_flight = 0
+        self.healthy = True
+        self.consecutive_failures = 0
+        self.retry_at = 0.0
+
+        self.requests = 0
+        self.failures = 0
+        self.latency_ewma = None
+        self.latency_max = 0.0
+
+    def load(self):
+        """Requests in flight relative to capacity, counting the one about to be routed."""
+        return (self.in_flight + 1) / self.capacity
+
+    def available(self, now):
+        if self.in_flight >= self.max_concurrency:
+            return False
+        # An unhealthy backend gets a single trial request once its cooldown is over
+        return self.healthy or (now >= self.retry_at and self.in_flight == 0)
+
+    def looks_hung(self, elapsed, limit):
+        """Whether a request that timed out after `elapsed` seconds says the backend is stuck."""
+        if not self.healthy or elapsed >= limit:
+            return True
+        if self.latency_ewma is None:
+            return False
+        return elapsed >= max(self.HANG_FACTOR * self.latency_ewma, self.HANG_MIN_SECONDS)
+
+    def record_success(self, latency):
+        self.requests += 1
+        self.consecutive_failures = 0
+        self.healthy = True
+        self.latency_max = max(self.latency_max, latency)
+        self.latency_ewma = latency if self.latency_ewma is None else 0.8 * self.latency_ewma + 0.2 * latency
+
+    def record_failure(self, failure_threshold, cooldown):
+        self.requests += 1
+        self.failures += 1
+        self.mark_failure(failure_threshold, cooldown)
+
+    def mark_failure(self, failure_threshold, cooldown):
+        self.consecutive_failures += 1
+        if self.consecutive_failures >= failure_threshold or not self.healthy:
+            if self.healthy:
+                print(f"⚠️  LLM backend {self.url} marked unhealthy")
+            self.healthy = False
+            self.retry_at = time.monotonic() + cooldown
+
+    def stats(self):
+        return {
+            "url": self.url,
+            "model": self.model,
+            "healthy": self.healthy,
+            "in_flight": self.in_flight,
+            "capacity": self.capacity,
+            "max_concurrency": self.max_concurrency,
+            "requests": self.requests,
+            "failures": self.failures,
+            "latency_ewma_ms": round(self.latency_ewma * 1000) if self.latency_ewma is not None else None,
+            "latency_max_ms": round(self.latency_max * 1000),
+        }
+
+
+class LLMPool:
+    """
+    Routes chat completions across several OpenAI-compatible backends.
+
+    Each request goes to the available backend with the fewest requests in
+    flight per unit of capacity. Backends have their own concurrency cap;
+    when every backend is at its cap, callers wait for a slot. After
+    `failure_threshold` consecutive failures or timeouts a backend is taken
+    out of rotation for `cooldown` seconds, then let back in by a
+    successful trial request, or a health probe if it has a health_url.
+    """
+
+    def __init__(self, backends, failure_threshold=3, cooldown=30.0, timeout=30.0):
+        if not backends:
+            raise ValueError("LLMPool needs at least one backend")
+        self.backends = backends
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.timeout = timeout
+        self._slot_freed = None
+
+    @classmethod
+    def from_config(cls):
+        """Build the pool from Config.LLM_BACKENDS (a JSON list of backend objects)."""
+        specs = json.loads(Config.LLM_BACKENDS) if Config.LLM_BACKENDS else [DEFAULT_BACKEND]
+        return cls(
+            [Backend(**spec) for spec in specs],
+            failure_threshold=Config.LLM_FAILURE_THRESHOLD,
+            cooldown=Config.LLM_COOLDOWN_SECONDS,
+            timeout=Config.LLM_TIMEOUT_SECONDS,
+        )
+
+    def _condition(self):
+        if self._slot_freed is None:
+            self._slot_freed = asyncio.Condition()
+        return self._slot_freed
+
+    def _pick(self, exclude=()):
+        now = time.monotonic()
+        candidates = [b for b in self.backends if b not in exclude and b.available(now)]
+        if not candidates:
+            return None
+        return min(candidates, key=Backend.load)
+
+    async def _acquire(self, exclude=()):
+        condition = self._condition()
+        async with condition:
+            while True:
+                backend = self._pick(exclude)
+                if backend is not None:
+                    backend.in_flight += 1
+                    return backend
+                candidates = [b for b in self.backends if b not in exclude]
+                now = time.monotonic()
+                upcoming = [b.retry_at for b in candidates if not b.healthy and b.retry_at > now]
+                if upcoming and not any(b.healthy for b in candidates):
+                    # Nothing healthy left; wake up when the next cooldown ends
+                    wait = max(0.05, min(upcoming) - now)
+                else:
+                    # A slot, trial request or probe will notify the condition
+                    wait = None
+                try:
+                    await asyncio.wait_for(condition.wait(), timeout=wait)
+                except asyncio.TimeoutError:
+                    pass
+
+    async def _release(self, backend):
+        backend.in_flight -= 1
+        condition = self._condition()
+        async with condition:
+            condition.notify_all()
+
+    async def _post(self, backend, prompt, timeout):
+        data = {
+            "model": backend.model,
+            "messages": [{"role": "user", "content": prompt}],
+            "temperature": 0.3
+        }
+        async with aiohttp.ClientSession() as session:
+            async with session.post(
+                backend.url,
+                json=data,
+                headers={"Content-Type": "application/json"},
+                timeout=aiohttp.ClientTimeout(total=timeout)
+            ) as response:
+                response.raise_for_status()
+                result = await response.json()
+
+        # Correct format for OpenAI-compatible API
+        if "choices" in result and len(result["choices"]) > 0:
+            return result["choices"][0]["message"]["content"]
+        return ""
+
+    async def complete(self, prompt, timeout=None, attempts=2):
+        """
+        Send prompt to the least-loaded backend, retrying a failure on a
+        different backend. timeout bounds the whole call, including waiting
+        for a free slot and the retry. Raises the last error if every attempt
+        fails, or asyncio.TimeoutError if time runs out first.
+        """
+        timeout = self.timeout if timeout is None else timeout
+        expires_at = time.monotonic() + timeout
+        tried = []
+        last_error = None
+
+        for _ in range(min(attempts, len(self.backends))):
+            remaining = expires_at - time.monotonic()
+            if remaining <= 0:
+                break
+            backend = await asyncio.wait_for(self._acquire(exclude=tried), timeout=remaining)
+            tried.append(backend)
+            start = time.monotonic()
+            try:
+                content = await self._post(backend, prompt, max(expires_at - start, 0.1))
+                backend.record_success(time.monotonic() - start)
+                return content
+            except asyncio.TimeoutError as e:
+                # A caller's short budget running out says nothing about a backend
+                # that usually answers in time
+                if backend.looks_hung(time.monotonic() - start, self.timeout):
+                    backend.record_failure(self.failure_threshold, self.cooldown)
+                last_error = e
+            except aiohttp.ClientError as e:
+                backend.record_failure(self.failure_threshold, self.cooldown)
+                last_error = e
+            finally:
+                await self._release(backend)
+
+        raise last_error or asyncio.TimeoutError()
+
+    async def probe(self, backend):
+        """GET the backend's health_url; bring it back into rotation if it answers."""
+        try:
+            async with aiohttp.ClientSession() as session:
+                async with session.get(backend.health_url, timeout=aiohttp.ClientTimeout(total=5)) as response:
+                    ok = response.status == 200
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            ok = False
+
+        # A failed probe changes nothing: the trial request after the cooldown still happens
+        if ok and not backend.healthy:
+            print(f"✅ LLM backend {backend.url} recovered")
+            backend.healthy = True
+            backend.consecutive_failures = 0
+            condition = self._condition()
+            async with condition:
+                condition.notify_all()
+        return ok
+
+    async def run_health_checks(self, interval=15.0):
+        """Background task: periodically probe unhealthy backends that have a health_url."""
+        while True:
+            await asyncio.gather(*[self.probe(b) for b in self.backends if b.health_url and not b.healthy])
+            await asyncio.sleep(interval)
+
+    def stats(self):
+        return [b.stats() for b in self.backends]
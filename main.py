@@ -1,25 +1,58 @@
 import asyncio
 import json
 import aiohttp
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException
-from fastapi.responses import JSONResponse
-from pydantic import BaseModel
-from typing import List
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel, Field
+from typing import List, Optional
 
-from description import fact_check_with_consensus, display_result
-from database import get_unverified_claims, mark_verified
+from description import fact_check_with_consensus, display_result, iter_fact_checks
+from database import get_unverified_claims, iter_unverified_claims, mark_verified
 from update import send_verified_claim_to_backend
+from resources import resources
+from config import Config
+from claim_cleaner import normalize_claims
+from verification import verification_record
+from reverify import iter_rechecks, run_recheck_cycle
 
 # Backend configuration
 BACKEND_URL = "http://localhost:5000/"  # Change to your backend URL
 BACKEND_ENDPOINT = "/api/claims/claimsWithVerification"  # Change to your backend endpoint
 
 
-app = FastAPI(title="Fact Checker API", version="1.0.0")
+background_task = None
+health_check_task = None
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Open shared connections and run the background fact-checker for the app's lifetime"""
+    global background_task, health_check_task
+    print("\n🚀 Server starting up...")
+    resources.start()
+    health_check_task = asyncio.create_task(
+        resources.llm_pool.run_health_checks(interval=Config.LLM_HEALTH_CHECK_SECONDS)
+    )
+    print("🤖 Starting agentic fact-checker background task...\n")
+    background_task = asyncio.create_task(continuous_fact_check())
+    try:
+        yield
+    finally:
+        if background_task:
+            background_task.cancel()
+            print("\n⛔ Background fact-checker stopped")
+        if health_check_task:
+            health_check_task.cancel()
+        resources.close()
+
+
+app = FastAPI(title="Fact Checker API", version="1.0.0", lifespan=lifespan)
 
 
 class ClaimRequest(BaseModel):
     claim: str
+    budget_seconds: Optional[float] = Field(None, gt=0)
 
 
 class FactCheckResponse(BaseModel):
@@ -30,6 +63,7 @@ class FactCheckResponse(BaseModel):
     urls: List[str]
     explanation: str
     sources: List[dict]
+    cut_short: List[str] = []
 
 
 @app.get("/")
@@ -41,8 +75,9 @@ async def root():
             "GET /": "Health check",
             "GET /claims/unverified": "Get all unverified claims",
             "POST /fact-check": "Fact-check a single claim",
-            "POST /fact-check/batch": "Fact-check multiple claims",
-            "POST /fact-check/all": "Fact-check all unverified claims from database"
+            "POST /fact-check/batch": "Fact-check multiple claims (streamed as NDJSON)",
+            "POST /fact-check/all": "Fact-check all unverified claims from database (streamed as NDJSON)",
+            "POST /fact-check/recheck": "Re-check verified claims whose verdicts are due (streamed as NDJSON)"
         }
     }
 
@@ -68,7 +103,7 @@ async def fact_check_single(request: ClaimRequest):
         raise HTTPException(status_code=400, detail="Claim cannot be empty")
     
     try:
-        result = await fact_check_with_consensus(request.claim)
+        result = (await fact_check_with_consensus(request.claim, budget=request.budget_seconds)).to_dict()
         
         # Send result to backend
         await send_to_backend(result)
@@ -78,57 +113,65 @@ async def fact_check_single(request: ClaimRequest):
         raise HTTPException(status_code=500, detail=f"Fact-check error: {str(e)}")
 
 
+async def stream_results(claims, concurrency: int = 1, budgets=None):
+    """
+    Yield one NDJSON line per result as soon as it is ready. The response
+    has already started by the time an error can happen, so errors are
+    reported as a final {"error": ...} line instead of an HTTP status.
+    """
+    count = 0
+    try:
+        async for index, result in iter_fact_checks(claims, concurrency=concurrency, budgets=budgets):
+            count += 1
+            print(f"\n[{count}] Finished claim #{index}")
+            yield json.dumps({"index": index, **result.to_dict()}) + "\n"
+    except Exception as e:
+        print(f"❌ Streaming stopped after {count} results: {str(e)}")
+        yield json.dumps({"error": f"Fact-check error: {str(e)}", "completed": count}) + "\n"
+
+
 @app.post("/fact-check/batch")
 async def fact_check_batch(requests: List[ClaimRequest]):
-    """Fact-check multiple claims concurrently"""
+    """Fact-check multiple claims concurrently, streaming results as they complete"""
     if not requests:
         raise HTTPException(status_code=400, detail="No claims provided")
     
     if len(requests) > 50:
         raise HTTPException(status_code=400, detail="Maximum 50 claims per request")
     
-    try:
-        results = await asyncio.gather(*[
-            fact_check_with_consensus(req.claim) for req in requests
-        ])
-        
-        return {
-            "count": len(results),
-            "results": results
-        }
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Batch fact-check error: {str(e)}")
+    claims = [req.claim for req in requests]
+    budgets = [req.budget_seconds for req in requests]
+    return StreamingResponse(
+        stream_results(claims, concurrency=min(len(claims), Config.BATCH_CONCURRENCY), budgets=budgets),
+        media_type="application/x-ndjson"
+    )
 
 
 @app.post("/fact-check/all")
 async def fact_check_all():
-    """Fact-check all unverified claims from database (sequentially)"""
-    try:
-        res = get_unverified_claims()
-        claims = [item['resolvedClaim'] for item in res]
-        
-        if not claims:
-            return {
-                "count": 0,
-                "message": "No unverified claims found",
-                "results": []
-            }
-        
-        print(f"\n📋 Fact-checking {len(claims)} claims...\n")
-        
-        results = []
-        for i, claim in enumerate(claims, 1):
-            print(f"\n[{i}/{len(claims)}] Processing claim...")
-            result = await fact_check_with_consensus(claim)
-            results.append(result)
-        
-        return {
-            "count": len(results),
-            "message": f"Successfully fact-checked {len(results)} claims",
-            "results": results
-        }
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Database or fact-check error: {str(e)}")
+    """Fact-check all unverified claims from database (sequentially), streaming results"""
+    # The cursor is lazy: database errors surface while streaming, as an error line
+    claims = (item['resolvedClaim'] for item in iter_unverified_claims())
+    return StreamingResponse(
+        stream_results(claims, concurrency=1),
+        media_type="application/x-ndjson"
+    )
+
+
+@app.post("/fact-check/recheck")
+async def fact_check_recheck(limit: Optional[int] = None):
+    """Re-check due verified claims; the LLM only runs where the evidence changed"""
+    async def stream():
+        count = 0
+        try:
+            async for claim, outcome in iter_rechecks(send_result_to_backend, limit):
+                count += 1
+                yield json.dumps({"claim": claim, "outcome": outcome}) + "\n"
+        except Exception as e:
+            print(f"❌ Re-check stopped after {count} claims: {str(e)}")
+            yield json.dumps({"error": f"Re-check error: {str(e)}", "completed": count}) + "\n"
+    
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
 
 
 @app.get("/health")
@@ -136,13 +179,11 @@ async def health_check():
     """Detailed health check"""
     return {
         "status": "healthy",
-        "service": "Fact Checker API"
+        "service": "Fact Checker API",
+        "llm_backends": resources.llm_pool.stats()
     }
 
 
-background_task = None
-
-
 async def send_to_backend(result: dict):
     """Send fact-check result to backend server"""
     try:
@@ -163,6 +204,11 @@ async def send_to_backend(result: dict):
         return False
 
 
+async def send_result_to_backend(result) -> bool:
+    """Send a re-checked verdict to the same endpoint as the original one"""
+    return await send_to_backend(result.to_dict())
+
+
 async def continuous_fact_check():
     """Background task that continuously fact-checks all unverified claims"""
     global background_task
@@ -179,27 +225,41 @@ async def continuous_fact_check():
             else:
                 print(f"\n📋 Fact-checking {len(res)} claims...\n")
                 
-                for i, doc in enumerate(res, 1):
-                    claim = doc['resolvedClaim']
+                normalized = normalize_claims(doc['resolvedClaim'] for doc in res)
+                
+                for i, (doc, normalized_claim) in enumerate(zip(res, normalized), 1):
+                    claim = normalized_claim.text
                     claim_id = doc['_id']
                     
                     print(f"\n[{i}/{len(res)}] Processing claim: {claim[:60]}...")
-                    result = await fact_check_with_consensus(claim)
-                    print(f"✅ Result: {result['verdict']} (Confidence: {result['score']}%)")
+                    result = await fact_check_with_consensus(claim, normalized_claim.query)
+                    print(f"✅ Result: {result.verdict} (Confidence: {result.score}%)")
                     
                     # Send result to backend
-                    backend_sent = await send_to_backend(result)
+                    backend_sent = await send_to_backend(result.to_dict())
                     
                     # Mark as verified in database ONLY if backend accepted it
                     if backend_sent:
                         try:
-                            mark_verified(claim_id)
+                            mark_verified(claim_id, verification_record(result))
                             print(f"✅ Marked as verified in database")
                         except Exception as e:
                             print(f"⚠️  Failed to mark as verified: {str(e)}")
                     else:
                         print(f"⚠️  Skipped marking as verified (backend failed)")
             
+            # Refresh verdicts that are due; the LLM only runs where evidence changed
+            if Config.RECHECK_IN_BACKGROUND:
+                counts = await run_recheck_cycle(send_result_to_backend)
+                if counts:
+                    print(f"\n♻️  Re-check cycle: {counts}")
+            
+            # Drop expired passages, then persist articles indexed during this cycle
+            evicted = await asyncio.to_thread(resources.evidence_index.evict_older_than)
+            if evicted:
+                print(f"\n🧹 Evicted {evicted} expired passages from the evidence index")
+            await asyncio.to_thread(resources.evidence_index.save)
+            
             # Wait 5 minutes before next cycle (adjust as needed)
             print(f"\n⏰ Next fact-check cycle in 5 minutes...\n")
             await asyncio.sleep(300)
@@ -210,24 +270,6 @@ async def continuous_fact_check():
             await asyncio.sleep(60)
 
 
-@app.on_event("startup")
-async def startup_event():
-    """Start background fact-checking task on server startup"""
-    global background_task
-    print("\n🚀 Server starting up...")
-    print("🤖 Starting agentic fact-checker background task...\n")
-    background_task = asyncio.create_task(continuous_fact_check())
-
-
-@app.on_event("shutdown")
-async def shutdown_event():
-    """Cancel background task on server shutdown"""
-    global background_task
-    if background_task:
-        background_task.cancel()
-        print("\n⛔ Background fact-checker stopped")
-
-
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
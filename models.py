@@ -0,0 +1,82 @@
+from dataclasses import dataclass, field
+
+
+@dataclass(slots=True)
+class NormalizedClaim:
+    """A raw claim with its canonical search query."""
+    text: str
+    query: str
+
+
+@dataclass(slots=True)
+class SearchHit:
+    """One result from the search API."""
+    title: str
+    link: str
+    snippet: str = ""
+
+
+@dataclass(slots=True)
+class Article:
+    """Extracted text of a trusted source. The text is dropped once packed into the prompt."""
+    title: str
+    url: str
+    trust: str
+    text: str
+    # verification.source_hash of the full extracted text, "" if unknown
+    source_hash: str = ""
+
+
+@dataclass(slots=True)
+class Passage:
+    """A chunk of a previously extracted trusted article, as stored in the evidence index."""
+    title: str
+    url: str
+    trust: str
+    text: str
+    added_at: float
+    # source_hash of the whole article the passage came from
+    source_hash: str = ""
+
+
+@dataclass(slots=True)
+class Source:
+    """Source reference kept on a verdict (title, link and a short snippet only)."""
+    title: str
+    link: str
+    snippet: str = ""
+
+    def to_dict(self) -> dict:
+        return {"title": self.title, "link": self.link, "snippet": self.snippet}
+
+
+@dataclass(slots=True)
+class FactCheckResult:
+    """Final verdict for one claim."""
+    claim: str
+    verdict: str
+    score: int
+    explanation_snippet: str
+    explanation: str
+    urls: list = field(default_factory=list)
+    sources: list = field(default_factory=list)
+    # Stages stopped early by the claim's time budget ("search", "extraction", "llm")
+    cut_short: list = field(default_factory=list)
+    # Fingerprint of the search result links behind the verdict ("" if the
+    # evidence came from the local index or the LLM failed), and (url, hash)
+    # per source (empty if the LLM failed); see verification.evidence_unchanged
+    evidence_fingerprint: str = ""
+    source_hashes: list = field(default_factory=list)
+
+    def to_dict(self) -> dict:
+        """Plain dict in the shape the API and Node backend expect."""
+        return {
+            "claim": self.claim,
+            "verdict": self.verdict,
+            "score": self.score,
+            "explanation_snippet": self.explanation_snippet,
+            "urls": list(self.urls),
+            "explanation": self.explanation,
+            "sources": [s.to_dict() for s in self.sources],
+            "cut_short": list(self.cut_short),
+        }
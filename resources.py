@@ -0,0 +1,85 @@
+from config import Config
+
+
+class Resources:
+    """
+    Holds long-lived connections and creates them on first use.
+
+    Nothing connects or loads at import time: the MongoDB client, the
+    local evidence index and the article fetch thread pool are only built
+    when something actually uses them.
+    The FastAPI lifespan calls start()/close() so the server warms them up
+    front and releases/persists them on shutdown; CLI runs use them lazily.
+    """
+
+    def __init__(self):
+        self._mongo_client = None
+        self._evidence_index = None
+        self._llm_pool = None
+        self._fetch_executor = None
+
+    @property
+    def mongo_client(self):
+        if self._mongo_client is None:
+            import pymongo  # deferred: pymongo/bson are slow to import
+            self._mongo_client = pymongo.MongoClient(Config.MONGODB_URI)
+        return self._mongo_client
+
+    @property
+    def db(self):
+        return self.mongo_client[Config.MONGODB_DB_NAME]
+
+    @property
+    def claims(self):
+        return self.db['claims']
+
+    @property
+    def evidence_index(self):
+        if self._evidence_index is None:
+            from evidence_index import EvidenceIndex  # deferred: pulls in numpy
+            self._evidence_index = EvidenceIndex(
+                path=Config.EVIDENCE_INDEX_DIR,
+                max_passages=Config.EVIDENCE_MAX_PASSAGES,
+                max_age_days=Config.EVIDENCE_MAX_AGE_DAYS,
+            )
+        return self._evidence_index
+
+    @property
+    def llm_pool(self):
+        if self._llm_pool is None:
+            from llm_pool import LLMPool
+            self._llm_pool = LLMPool.from_config()
+        return self._llm_pool
+
+    @property
+    def fetch_executor(self):
+        # Article fetches get their own pool so they can't starve, or be
+        # starved by, other asyncio.to_thread work
+        if self._fetch_executor is None:
+            from concurrent.futures import ThreadPoolExecutor
+            self._fetch_executor = ThreadPoolExecutor(
+                max_workers=Config.FETCH_WORKERS, thread_name_prefix="fetch"
+            )
+        return self._fetch_executor
+
+    def start(self):
+        """Create connections eagerly (used by the app lifespan)."""
+        _ = self.mongo_client
+        _ = self.evidence_index
+        _ = self.llm_pool
+
+    def close(self):
+        """Close any connections that were opened and persist the evidence index."""
+        if self._evidence_index is not None:
+            self._evidence_index.save()
+        if self._mongo_client is not None:
+            self._mongo_client.close()
+            self._mongo_client = None
+        self._evidence_index = None
+        if self._fetch_executor is not None:
+            # Queued fetches are dropped; running ones end at their own timeout
+            self._fetch_executor.shutdown(wait=False, cancel_futures=True)
+            self._fetch_executor = None
+
+
+resources = Resources()
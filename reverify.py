@@ -0,0 +1,157 @@
+"""
+Incremental re-verification of already verified claims.
+
+Each verified claim stores the fingerprint of the evidence behind its
+verdict and a next_check_at time (see verification.py). A re-check cycle
+picks up the claims that are due, gathers fresh evidence and compares
+fingerprints: if nothing changed the verdict's validity is extended
+without calling the LLM; only claims whose sources changed are judged
+again. Claims verified before fingerprints existed just get one recorded
+on their first re-check.
+
+Changed verdicts are published with a `send` coroutine supplied by the
+caller (result -> bool), so they reach the same backend as the verdicts
+they replace: the API server passes its own sender, the CLI sends to the
+Node backend like description.py does.
+"""
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+from claim_cleaner import normalize_claims
+from config import Config
+from database import get_claims_due_for_recheck, mark_verified, update_verification_schedule
+from deadline import Deadline
+from description import gather_evidence, judge_claim
+from resources import resources
+from update import send_verified_claim_to_backend
+from verification import evidence_fingerprint, evidence_unchanged, next_check_interval, verification_record
+
+
+def _postpone(claim_id, now, reason: str) -> str:
+    """Leave the stored verdict alone and try again in RECHECK_RETRY_HOURS."""
+    print(f"  ⏱️  {reason}, re-check postponed")
+    update_verification_schedule(
+        claim_id,
+        next_check_at=now + timedelta(hours=Config.RECHECK_RETRY_HOURS)
+    )
+    return "postponed"
+
+
+async def recheck_claim(doc, query: str, send) -> str:
+    """
+    Re-check one verified claim. Returns what happened:
+    "unchanged" (validity extended, no LLM call), "seeded" (first
+    fingerprint stored for an older verdict, no LLM call), "changed"
+    (re-judged), or "postponed" (the search, extraction, LLM or backend failed or ran
+    out of time; the stored verdict stands and is tried again later).
+    A changed verdict is sent with `send` before it is stored.
+    """
+    claim_id = doc["_id"]
+    claim = doc["resolvedClaim"]
+    stored = doc.get("verification") or {}
+    now = datetime.now(timezone.utc)
+
+    deadline = Deadline(Config.CLAIM_BUDGET_SECONDS)
+    reserve = min(Config.LLM_RESERVE_SECONDS, deadline.budget / 2)
+    links, trusted_articles = await gather_evidence(query, deadline, reserve, fresh=True)
+
+    # A partial or failed evidence set can't be compared with the stored one
+    if deadline.cut_short:
+        return _postpone(claim_id, now, f"Evidence incomplete ({', '.join(deadline.cut_short)})")
+    if links is None:
+        return _postpone(claim_id, now, "Search failed")
+    # Losing every source of a verdict that had some is more likely an outage
+    # than a real change; a verdict that had none is just confirmed
+    if not trusted_articles and stored.get("source_hashes"):
+        reason = "Search returned nothing" if trusted_articles is None else "No sources could be extracted"
+        return _postpone(claim_id, now, reason)
+
+    fingerprint, source_hashes = evidence_fingerprint(links, trusted_articles or [])
+
+    # Claims verified before fingerprints were stored have nothing to compare
+    # with; today's evidence becomes their baseline instead of a new verdict
+    seeding = stored.get("evidence_fingerprint") is None
+    if seeding or evidence_unchanged(stored, fingerprint, source_hashes):
+        stable_checks = 0 if seeding else stored.get("stable_checks", 0) + 1
+        interval = next_check_interval(stored.get("verdict"), stored.get("score", 0), stable_checks)
+        if seeding:
+            print(f"  🌱 Evidence recorded for the existing verdict, next check in {interval.days} days")
+        else:
+            print(f"  ♻️  Evidence unchanged, verdict valid for {interval.days} more days")
+        # Keep the complete fresh evidence, so the next re-check compares against all of it
+        update_verification_schedule(
+            claim_id,
+            evidence_fingerprint=fingerprint,
+            source_hashes=[{"url": url, "hash": digest} for url, digest in source_hashes],
+            checked_at=now,
+            stable_checks=stable_checks,
+            next_check_at=now + interval
+        )
+        return "seeded" if seeding else "unchanged"
+
+    print("  🔄 Evidence changed, re-judging...")
+    result = await judge_claim(claim, links, trusted_articles, deadline)
+    if not result.evidence_fingerprint:
+        return _postpone(claim_id, now, "LLM failed")
+
+    if result.verdict != stored.get("verdict") or result.score != stored.get("score"):
+        # Store the new verdict only once the backend has it, so a failed send is retried
+        if not await send(result):
+            return _postpone(claim_id, now, "Backend didn't accept the updated verdict")
+    mark_verified(claim_id, verification_record(result, now))
+    return "changed"
+
+
+async def send_to_node_backend(result) -> bool:
+    """Send an updated verdict to the Node backend (used by CLI runs)."""
+    try:
+        await asyncio.to_thread(
+            send_verified_claim_to_backend,
+            claim=result.claim,
+            verdict=result.verdict,
+            score=result.score,
+            explanation_snippet=result.explanation_snippet,
+            urls=result.urls,
+            explanation=result.explanation,
+            sources=[s.to_dict() for s in result.sources],
+        )
+        return True
+    except Exception as e:
+        print(f"⚠️  Failed to send updated verdict to backend: {str(e)}")
+        return False
+
+
+async def iter_rechecks(send, limit: int = None):
+    """Re-check the claims that are due, yielding (claim, outcome) for each."""
+    limit = limit or Config.RECHECK_BATCH_SIZE
+    docs = get_claims_due_for_recheck(datetime.now(timezone.utc), limit)
+    normalized = normalize_claims(doc["resolvedClaim"] for doc in docs)
+
+    for i, (doc, claim) in enumerate(zip(docs, normalized), 1):
+        print(f"\n[{i}/{len(docs)}] Re-checking claim: {claim.text[:60]}...")
+        try:
+            outcome = await recheck_claim(doc, claim.query, send)
+        except Exception as e:
+            print(f"⚠️  Re-check failed: {str(e)}")
+            outcome = "error"
+        yield claim.text, outcome
+
+
+async def run_recheck_cycle(send, limit: int = None) -> dict:
+    """Re-check all due claims (up to limit) and return a count per outcome."""
+    counts = {}
+    async for _, outcome in iter_rechecks(send, limit):
+        counts[outcome] = counts.get(outcome, 0) + 1
+    return counts
+
+
+async def main():
+    counts = await run_recheck_cycle(send_to_node_backend)
+    print(f"\n📋 Re-check cycle finished: {counts or 'no claims due'}")
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    finally:
+        resources.close()
@@ -1,15 +1,8 @@
-from database import db
+from database import mark_verified  # re-exported for existing callers
 import requests
 import json
 from config import Config
 
-def mark_verified(claim_id):
-    claims = db['claims']
-    claims.update_one(
-        {"_id": claim_id},
-        {"$set": {"verified": True}}
-    )
-
 
 def send_verified_claim_to_backend(claim, verdict, score, explanation_snippet, urls, explanation, sources):
     # Fix verdict: ensure it's valid for the schema
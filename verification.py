@@ -0,0 +1,86 @@
+import hashlib
+from datetime import datetime, timedelta, timezone
+
+from config import Config
+
+CONFIDENT_VERDICTS = {"Likely True", "Likely False"}
+
+
+def source_hash(text: str) -> str:
+    """Hash of an extracted article body, insensitive to whitespace changes."""
+    return hashlib.blake2b(" ".join(text.split()).encode("utf-8"), digest_size=16).hexdigest()
+
+
+def evidence_fingerprint(links, articles):
+    """
+    Describe the evidence a verdict was based on, in a form a re-check can
+    reproduce. Returns (fingerprint, [(url, source_hash), ...]).
+
+    The fingerprint covers the full set of search result links, not which
+    of them got extracted (that depends on early stopping and timing); it is
+    "" when links is None, i.e. the evidence came from the local index.
+    Sources are listed by URL with the hash of their full extracted text,
+    so they can be compared one by one (see evidence_unchanged).
+    """
+    source_hashes = sorted((a.url, a.source_hash) for a in articles if a.source_hash)
+    if links is None:
+        return "", source_hashes
+    h = hashlib.blake2b(digest_size=16)
+    for link in sorted(set(links)):
+        h.update(f"link {link}\n".encode("utf-8"))
+    return h.hexdigest(), source_hashes
+
+
+def evidence_unchanged(stored: dict, fingerprint: str, source_hashes) -> bool:
+    """
+    Whether freshly gathered evidence matches what a stored verdict (its
+    `verification` sub-document) was based on: the same search result
+    links, and the same text for every source both runs extracted. Sources
+    only one run extracted don't count. A verdict built from the local index
+    has no link fingerprint, so only its sources are compared; one whose
+    LLM call failed has neither, and always counts as changed.
+    """
+    stored_fingerprint = stored.get("evidence_fingerprint")
+    if stored_fingerprint is None:
+        return False
+    if stored_fingerprint and stored_fingerprint != fingerprint:
+        return False
+
+    old = {s["url"]: s["hash"] for s in stored.get("source_hashes", [])}
+    new = dict(source_hashes)
+    common = old.keys() & new.keys()
+    if not common:
+        # Nothing to compare, unless neither run had any trusted source
+        return bool(stored_fingerprint) and not old and not new
+    return all(old[url] == new[url] for url in common)
+
+
+def next_check_interval(verdict: str, score: int, stable_checks: int = 0) -> timedelta:
+    """
+    How long a verdict stays valid before it is re-checked.
+
+    Confident verdicts last longer in proportion to their score; uncertain
+    ones come back sooner. Every re-check that finds the evidence unchanged
+    stretches the interval by 1.5x, up to RECHECK_MAX_DAYS.
+    """
+    if verdict in CONFIDENT_VERDICTS:
+        weight = 0.25 + 0.75 * max(0, min(score, 100)) / 100
+    else:
+        weight = 0.25
+    days = Config.RECHECK_BASE_DAYS * weight * (1.5 ** stable_checks)
+    return timedelta(days=min(days, Config.RECHECK_MAX_DAYS))
+
+
+def verification_record(result, now: datetime = None, stable_checks: int = 0) -> dict:
+    """The `verification` sub-document stored on a claim alongside verified: True."""
+    now = now or datetime.now(timezone.utc)
+    return {
+        "verdict": result.verdict,
+        "score": result.score,
+        "evidence_fingerprint": result.evidence_fingerprint,
+        "source_hashes": [{"url": url, "hash": digest} for url, digest in result.source_hashes],
+        "verified_at": now,
+        "checked_at": now,
+        "stable_checks": stable_checks,
+        "next_check_at": now + next_check_interval(result.verdict, result.score, stable_checks),
+    }